@@ -1,13 +1,15 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from functools import cached_property
 from pathlib import Path
 
 from typing import Optional
+from urllib.parse import quote
 
-from redis.asyncio import Redis
+from redis.asyncio import BlockingConnectionPool, Redis
 from litestar.stores.redis import RedisStore
 
-from pydantic import AmqpDsn, PostgresDsn, field_validator
+from pydantic import field_validator
 from pydantic_core.core_schema import FieldValidationInfo
 
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
@@ -48,15 +50,12 @@ class Database(CurrentEnvType):
     ) -> str:
         if isinstance(v, str):
             return v
-        return str(
-            PostgresDsn.build(
-                scheme="postgresql+asyncpg",
-                username=info.data.get("POSTGRES_USER"),
-                password=info.data.get("POSTGRES_PASSWORD"),
-                host=info.data.get("POSTGRES_HOST"),
-                port=info.data.get("POSTGRES_PORT"),
-                path=f"{info.data.get('POSTGRES_DB') or ''}",
-            )
+        password = quote(info.data.get("POSTGRES_PASSWORD") or "", safe="")
+        return (
+            "postgresql+asyncpg://"
+            f"{info.data.get('POSTGRES_USER')}:{password}"
+            f"@{info.data.get('POSTGRES_HOST')}:{info.data.get('POSTGRES_PORT')}"
+            f"/{info.data.get('POSTGRES_DB') or ''}"
         )
 
     @field_validator("ENGINE", mode="before")
@@ -108,17 +107,38 @@ class LogSettings(CurrentEnvType):
 class RedisSettings(CurrentEnvType):
     REDIS_URL: str
 
+    POOL_MAX_CONNECTIONS: int = 64
+    POOL_WAIT_TIMEOUT: int = 5
+    """Seconds to wait for a free connection once the pool is exhausted."""
+    POOL_HEALTH_CHECK_INTERVAL: int = 30
+    SOCKET_KEEPALIVE: bool = True
+
+    _pool: BlockingConnectionPool | None = None
     _instance: Redis | None = None
     _store: RedisStore | None = None
 
+    @property
+    def pool(self) -> BlockingConnectionPool:
+        if self._pool is None:
+            self._pool = BlockingConnectionPool.from_url(
+                self.REDIS_URL,
+                max_connections=self.POOL_MAX_CONNECTIONS,
+                timeout=self.POOL_WAIT_TIMEOUT,
+                health_check_interval=self.POOL_HEALTH_CHECK_INTERVAL,
+                socket_keepalive=self.SOCKET_KEEPALIVE,
+            )
+        return self._pool
+
     @property
     def instance(self) -> Redis:
-        self._instance = RedisStore.with_client(url=self.REDIS_URL)._redis
+        if self._instance is None:
+            self._instance = Redis(connection_pool=self.pool)
         return self._instance
 
     @property
     def store(self) -> RedisStore:
-        self._store = RedisStore(redis=self.instance, namespace="users")
+        if self._store is None:
+            self._store = RedisStore(redis=self.instance, namespace="users")
         return self._store
 
     # @field_validator("REDIS_URI", mode="before")
@@ -165,36 +185,33 @@ class RabbitMQSettings(CurrentEnvType):
     ) -> str:
         if isinstance(v, str):
             return v
-        return str(
-            AmqpDsn.build(
-                scheme="amqp",
-                username=info.data.get("AMQP_USER"),
-                password=info.data.get("AMQP_PASSWORD"),
-                host=info.data.get("AMQP_HOST"),
-                port=info.data.get("AMQP_PORT"),
-            )
+        password = quote(info.data.get("AMQP_PASSWORD") or "", safe="")
+        return (
+            "amqp://"
+            f"{info.data.get('AMQP_USER')}:{password}"
+            f"@{info.data.get('AMQP_HOST')}:{info.data.get('AMQP_PORT')}"
         )
     
     
 
 
 class Settings(CurrentEnvType):
-    @property
+    @cached_property
     def database(self) -> Database:
         return Database()
 
-    @property
+    @cached_property
     def logging(self) -> LogSettings:
         return LogSettings()
 
-    @property
+    @cached_property
     def redis(self) -> RedisSettings:
         return RedisSettings()
 
-    @property
+    @cached_property
     def auth(self) -> AuthenticationSettings:
         return AuthenticationSettings()
 
-    @property
+    @cached_property
     def rabbitmq(self) -> RabbitMQSettings:
         return RabbitMQSettings()
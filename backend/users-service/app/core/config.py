@@ -9,6 +9,8 @@ from litestar.plugins.structlog import StructlogConfig
 from litestar.logging.config import LoggingConfig, StructLoggingConfig
 from litestar.middleware.logging import LoggingMiddlewareConfig
 
+from app.database.models import RefreshToken
+from app.lib.batching import BatchInsertWriter
 from app.utils.message_brokers import RabbitMQConfig
 
 from .base import Settings
@@ -28,6 +30,12 @@ alchemy_config = SQLAlchemyAsyncConfig(
 
 cache_config = ResponseCacheConfig(store=settings.redis.store)
 
+refresh_token_store = cache_config.store.with_namespace("refresh_tokens")
+
+refresh_token_writer = BatchInsertWriter(
+    model=RefreshToken, session_maker=alchemy_config.create_session_maker()
+)
+
 log_config = StructlogConfig(
     structlog_logging_config=StructLoggingConfig(
         log_exceptions="always",
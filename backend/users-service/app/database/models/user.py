@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, ForeignKey, Integer, String
+from sqlalchemy import Boolean, ForeignKey, Integer, LargeBinary, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -17,10 +17,12 @@ class User(Base):
 
 
 class RefreshToken(Base):
-    refresh_token: Mapped[str] = mapped_column(String)
+    refresh_token: Mapped[bytes] = mapped_column(
+        LargeBinary(32), unique=True, index=True
+    )
     expires_in: Mapped[int]
     user_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("users.id", ondelete="CASCADE")
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), unique=True
     )
 
     user: Mapped["User"] = relationship(
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Annotated
 
 from litestar import Request, Response, post
@@ -8,13 +9,14 @@ from litestar.controller import Controller
 from litestar.enums import RequestEncodingType
 from litestar.security.jwt import OAuth2Login
 
-from app.core import settings
+from advanced_alchemy.exceptions import NotFoundError
+
 from app.database.models import User
 from app.domain.services import RefreshTokenService, UserService
 from app.domain.schemas import PydanticUserCreate, PydanticUserCredentials, UserOutputDTO
 from app.domain.dependencies import provide_users_service, provide_refresh_token_service
 from app.domain.guards import o2auth
-from app.lib.security.jwt import generate_refresh_token
+from app.lib.security.jwt import REFRESH_TOKEN_EXPIRES_SECONDS
 
 
 class AuthController(Controller):
@@ -59,17 +61,17 @@ class AuthController(Controller):
         # create user
         user = await user_service.authenticate(data)
         # create refresh_token in db and return it in cookie
-        response = o2auth.login(str(user.id))
-
-        refresh_token = generate_refresh_token()
+        response = await asyncio.to_thread(o2auth.login, str(user.id))
 
-        if not user.refresh_token:
+        if user.refresh_token:
+            refresh_token = await refresh_token_service.rotate(user.refresh_token)
+        else:
             refresh_token = await refresh_token_service.create(user.id)
 
         response.set_cookie(
             "refresh_token",
             value=refresh_token,
-            max_age=settings.auth.REFRESH_TOKEN_EXPIRE_DAYS * 60 * 60 * 24,
+            max_age=REFRESH_TOKEN_EXPIRES_SECONDS,
             httponly=True,
         )
 
@@ -85,7 +87,13 @@ class AuthController(Controller):
         response = Response(content={"Logout": "Ok"}, status_code=200)
 
         response.delete_cookie("refresh_token")
-        _ = await refresh_token_service.delete(refresh_token)
+
+        if refresh_token:
+            try:
+                _ = await refresh_token_service.delete(refresh_token)
+            except NotFoundError:
+                # unknown or already rotated token: the session is gone already
+                pass
 
         return response
 
@@ -101,16 +109,10 @@ class AuthController(Controller):
                 detail="Couldn't find refresh_token in cookies", status_code=404
             )
 
-        access_token_header = request.headers.get("Authorization")
-        if not access_token_header:
-            raise HTTPException(
-                detail="Authorization header with expired access token must be in request"
-            )
-
         new_access_token = await refresh_token_service.refresh_access_token(
-            refresh_token, access_token_header
+            refresh_token
         )
 
         return Response(
-            headers={"Authotization": f"Bearer {new_access_token}"}, status_code=200
+            headers={"Authorization": f"Bearer {new_access_token}"}, status_code=200
         )
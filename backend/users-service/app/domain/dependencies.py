@@ -4,6 +4,7 @@ from litestar import Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from aio_pika.abc import AbstractConnection
 
+from app.core.config import refresh_token_store, refresh_token_writer
 from app.database.models.user import User
 from app.domain.services import RefreshTokenService, UserService
 from app.utils.message_brokers import RabbitMQPublisher
@@ -12,7 +13,7 @@ from app.utils.message_brokers import RabbitMQPublisher
 async def provide_users_service(
     db_session: AsyncSession,
 ) -> AsyncGenerator[UserService, None]:
-    yield UserService(session=db_session)
+    yield UserService(session=db_session, refresh_token_cache=refresh_token_store)
 
 
 async def provide_message_broker(
@@ -24,7 +25,9 @@ async def provide_message_broker(
 async def provide_refresh_token_service(
     db_session: AsyncSession,
 ) -> AsyncGenerator[RefreshTokenService, None]:
-    yield RefreshTokenService(session=db_session)
+    yield RefreshTokenService(
+        session=db_session, cache=refresh_token_store, writer=refresh_token_writer
+    )
 
 
 async def current_user(request: Request) -> User:
@@ -1,10 +1,13 @@
+from collections import OrderedDict
 from datetime import timedelta
-from typing import Any
+from time import time
+from typing import Any, ClassVar
 
 
-from litestar.exceptions import PermissionDeniedException
+from litestar.exceptions import NotAuthorizedException, PermissionDeniedException
 from litestar.connection import ASGIConnection
-from litestar.security.jwt import Token, JWTAuth
+from litestar.middleware.authentication import AuthenticationResult
+from litestar.security.jwt import Token, JWTAuth, JWTAuthenticationMiddleware
 from litestar.handlers.base import BaseRouteHandler
 
 from app.core import settings
@@ -12,6 +15,7 @@ from app.core.config import alchemy_config
 from app.database.models import User
 from app.domain.services import UserService
 from app.domain.dependencies import provide_users_service
+from app.lib.security.jwt import PRIVATE_KEY
 
 
 async def current_user_from_token(
@@ -28,6 +32,40 @@ async def current_user_from_token(
     return user
 
 
+class CachedJWTAuthenticationMiddleware(JWTAuthenticationMiddleware):
+    """JWT middleware that skips signature verification for recently verified tokens."""
+
+    max_cached_tokens: ClassVar[int] = 10_000
+
+    # shared by the middleware instances Litestar builds for each route stack
+    _verified_tokens: ClassVar[OrderedDict[str, Token]] = OrderedDict()
+
+    async def authenticate_token(
+        self, encoded_token: str, connection: ASGIConnection[Any, Any, Any, Any]
+    ) -> AuthenticationResult:
+        verified_tokens = self._verified_tokens
+
+        if token := verified_tokens.get(encoded_token):
+            if token.exp.timestamp() > time():
+                verified_tokens.move_to_end(encoded_token)
+
+                user = await self.retrieve_user_handler(token, connection)
+                if not user:
+                    raise NotAuthorizedException("Invalid credentials")
+
+                return AuthenticationResult(user=user, auth=token)
+
+            del verified_tokens[encoded_token]
+
+        result = await super().authenticate_token(encoded_token, connection)
+
+        verified_tokens[encoded_token] = result.auth
+        if len(verified_tokens) > self.max_cached_tokens:
+            verified_tokens.popitem(last=False)
+
+        return result
+
+
 async def super_user_guard(connection: ASGIConnection[Any, Any, Any, Any], _: BaseRouteHandler) -> None:
     if connection.user.is_superuser:
         return
@@ -36,8 +74,10 @@ async def super_user_guard(connection: ASGIConnection[Any, Any, Any, Any], _: Ba
 
 o2auth = JWTAuth[User](
     retrieve_user_handler=current_user_from_token,
-    token_secret=settings.auth.JWT_PRIVATE_KEY_PATH.read_text(),
+    # the parsed key: PyJWT would otherwise re-parse the PEM on every encode/decode
+    token_secret=PRIVATE_KEY,
     algorithm=settings.auth.ALGORITHM,
     default_token_expiration=timedelta(minutes=settings.auth.ACCESS_TOKEN_EXPIRE_MINUTES),
+    authentication_middleware_class=CachedJWTAuthenticationMiddleware,
     exclude=["/api/schema", "/api/auth/"],
 )
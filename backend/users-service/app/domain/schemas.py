@@ -50,6 +50,11 @@ class StructUser(SctructBaseUser):
     id: int = None
 
 
+class StructRefreshToken(CamelizedBaseStructModel):
+    user_id: int
+    expires_at: float
+
+
 class PydanticBaseUser(PydanticBaseModel):
     email: Optional[EmailStr] = None
     is_active: Optional[bool] = True
@@ -78,17 +83,7 @@ class PydanticUserCredentials(PydanticBaseModel):
     password: str
 
 
-class AccessTokenPayload(PydanticBaseModel):
-    sub: str | None
-
-
 class Token(PydanticBaseModel):
     access_token: str
     access_token_type: str
     refresh_token: str
-
-
-class RefreshTokenCreate(PydanticBaseModel):
-    refresh_token: str
-    expires_in: int | float
-    user_id: int
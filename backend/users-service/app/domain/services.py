@@ -1,6 +1,9 @@
-from datetime import datetime, timedelta, timezone
+import asyncio
+from time import time
 from typing import Any, TypeVar, Dict, TypeAlias, Union
 
+import msgspec
+
 from pydantic import BaseModel
 from dataclasses import is_dataclass, asdict, dataclass
 
@@ -8,9 +11,11 @@ from pydantic import validate_email
 from email_validator import EmailNotValidError
 
 from litestar.exceptions import NotFoundException, HTTPException
+from litestar.stores.base import Store
 
 from sqlalchemy import Select, StatementLambdaElement, select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.exc import IntegrityError as SQLAlchemyIntegrityError
+from sqlalchemy.orm import joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.ext.asyncio.scoping import async_scoped_session
 
@@ -22,16 +27,17 @@ from advanced_alchemy.exceptions import (
     NotFoundError,
 )
 
-from app.core import settings
 from app.database.models import User, RefreshToken
 from app.domain.repositories import UserRepository, RefreshTokenRepository
-from app.domain.schemas import PydanticUser, RefreshTokenCreate
+from app.domain.schemas import PydanticUser, StructRefreshToken
+from app.lib.batching import BatchInsertWriter
 from app.lib.security.crypt import generate_hashed_password, verify_password
 from app.lib.exceptions import IntegrityException, EmailValidationException
 from app.lib.security.jwt import (
-    decode_jwt_token,
+    REFRESH_TOKEN_EXPIRES_SECONDS,
     encode_jwt_token,
     generate_refresh_token,
+    hash_refresh_token,
 )
 
 
@@ -51,8 +57,10 @@ class UserService(SQLAlchemyAsyncRepositoryService[User]):
         auto_expunge: bool = False,
         auto_refresh: bool = True,
         auto_commit: bool = True,
+        refresh_token_cache: Store | None = None,
         **repo_kwargs: Any,
     ) -> None:
+        self.refresh_token_cache = refresh_token_cache
         self.repository = self.repository_type(
             statement=statement,
             session=session,
@@ -75,7 +83,7 @@ class UserService(SQLAlchemyAsyncRepositoryService[User]):
 
     async def get_user_with_refresh_token(self, **kwargs) -> User:
         return await self.get_one_or_none(
-            statement=select(User).options(selectinload(User.refresh_token)), **kwargs
+            statement=select(User).options(joinedload(User.refresh_token)), **kwargs
         )
 
     async def get_users(self, *filters: FilterTypes) -> OffsetPagination[PydanticUser]:
@@ -136,6 +144,17 @@ class UserService(SQLAlchemyAsyncRepositoryService[User]):
         except Exception as ex:
             raise HTTPException(detail=f"{ex}")
 
+    async def delete(self, user_id: int) -> User:
+        user = await self.get_user_with_refresh_token(id=user_id)
+
+        if user and user.refresh_token and self.refresh_token_cache:
+            # the row goes with the user (ON DELETE CASCADE), its cache entry doesn't
+            await self.refresh_token_cache.delete(
+                user.refresh_token.refresh_token.hex()
+            )
+
+        return await super().delete(user_id)
+
     async def authenticate(self, data: InputModelT) -> User:
         if is_dataclass(data):
             _schema: dict[str, Any] = asdict(data)
@@ -158,14 +177,17 @@ class RefreshTokenService(SQLAlchemyAsyncRepositoryService[RefreshToken]):
     def __init__(
         self,
         session: AsyncSession | async_scoped_session[AsyncSession],
-        statement: Select[tuple[RefreshToken]] | StatementLambdaElement | None = select(
-            RefreshToken
-        ).options(selectinload(RefreshToken.user)),
+        statement: Select[tuple[RefreshToken]] | StatementLambdaElement | None = None,
         auto_expunge: bool = False,
         auto_refresh: bool = True,
         auto_commit: bool = True,
+        cache: Store | None = None,
+        writer: BatchInsertWriter | None = None,
         **repo_kwargs: Any,
     ) -> None:
+        self.cache = cache
+        self.writer = writer
+
         super().__init__(
             session, statement, auto_expunge, auto_refresh, auto_commit, **repo_kwargs
         )
@@ -176,38 +198,114 @@ class RefreshTokenService(SQLAlchemyAsyncRepositoryService[RefreshToken]):
 
     async def create(self, user_id: int) -> str:
         refresh_token: str = generate_refresh_token()
+        token_hash = hash_refresh_token(refresh_token)
+
+        _schema: dict[str, Any] = {
+            "refresh_token": token_hash,
+            "expires_in": REFRESH_TOKEN_EXPIRES_SECONDS,
+            "user_id": user_id,
+        }
 
-        _schema: dict = RefreshTokenCreate(
-            refresh_token=refresh_token,
-            expires_in=timedelta(
-                days=float(settings.auth.REFRESH_TOKEN_EXPIRE_DAYS)
-            ).total_seconds(),
-            user_id=user_id,
-        ).model_dump()
+        refresh_session = StructRefreshToken(
+            user_id=user_id, expires_at=time() + REFRESH_TOKEN_EXPIRES_SECONDS
+        )
 
-        await super().create(_schema)
+        inserted, _ = await asyncio.gather(
+            self._insert_refresh_token(_schema),
+            self._cache_refresh_session(token_hash, refresh_session),
+        )
+
+        if not inserted:
+            # a concurrent login already opened this user's session: rotate that one
+            if self.cache:
+                await self.cache.delete(token_hash.hex())
+
+            if current := await self.get_one_or_none(user_id=user_id):
+                return await self.rotate(current)
+            return await self.create(user_id)
 
         return refresh_token
 
+    async def rotate(self, refresh_token: RefreshToken) -> str:
+        if self.cache:
+            await self.cache.delete(refresh_token.refresh_token.hex())
+
+        try:
+            await super().delete(refresh_token.id)
+        except NotFoundError:
+            # already rotated or revoked by a concurrent request
+            pass
+
+        return await self.create(refresh_token.user_id)
+
+    async def _insert_refresh_token(self, data: dict[str, Any]) -> bool:
+        try:
+            if self.writer:
+                await self.writer.write(data)
+            else:
+                await super().create(data)
+        except (IntegrityError, SQLAlchemyIntegrityError):
+            if not self.writer:
+                await self.repository.session.rollback()
+            return False
+
+        return True
+
     async def delete(self, refresh_token: str) -> RefreshToken:
-        return await super().delete(id_attribute=refresh_token)
+        token_hash = hash_refresh_token(refresh_token)
+
+        if self.cache:
+            await self.cache.delete(token_hash.hex())
+
+        return await super().delete(token_hash, id_attribute="refresh_token")
+
+    async def get_refresh_session(
+        self, refresh_token: str
+    ) -> StructRefreshToken | None:
+        token_hash = hash_refresh_token(refresh_token)
+
+        if self.cache and (cached := await self.cache.get(token_hash.hex())):
+            return msgspec.json.decode(cached, type=StructRefreshToken)
+
+        db_refresh_token = await self.get_one_or_none(refresh_token=token_hash)
+
+        if not db_refresh_token:
+            return None
 
-    async def refresh_access_token(
-        self, refresh_token: str, access_token_header: str
-    ) -> str:
-        refresh_token = await self.get_one_or_none(refresh_token=refresh_token)
+        refresh_session = StructRefreshToken(
+            user_id=db_refresh_token.user_id,
+            expires_at=db_refresh_token.created_at.timestamp()
+            + db_refresh_token.expires_in,
+        )
+
+        await self._cache_refresh_session(token_hash, refresh_session)
+
+        return refresh_session
+
+    async def _cache_refresh_session(
+        self, token_hash: bytes, refresh_session: StructRefreshToken
+    ) -> None:
+        # sessions must be revoked through the services, which evict this entry;
+        # rows deleted straight in Postgres stay usable until the entry expires
+        expires_in = int(refresh_session.expires_at - time())
+
+        if self.cache and expires_in > 0:
+            await self.cache.set(
+                token_hash.hex(),
+                msgspec.json.encode(refresh_session),
+                expires_in=expires_in,
+            )
 
-        if not refresh_token:
+    async def refresh_access_token(self, refresh_token: str) -> str:
+        refresh_session = await self.get_refresh_session(refresh_token)
+
+        if not refresh_session:
             raise HTTPException(detail="Invalid refresh token", status_code=401)
 
-        if datetime.now(timezone.utc) > refresh_token.created_at + timedelta(
-            seconds=refresh_token.expires_in
-        ):
-            await self.delete(refresh_token.id)
+        if time() > refresh_session.expires_at:
+            await self.delete(refresh_token)
             raise HTTPException(
                 detail="Refresh token expires, you must log in again", status_code=401
             )
 
-        expired_access_token = decode_jwt_token(access_token_header)
-
-        return encode_jwt_token(expired_access_token.sub)
+        return await asyncio.to_thread(encode_jwt_token, str(refresh_session.user_id))
@@ -0,0 +1,94 @@
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import DeclarativeBase
+
+_Item = tuple[dict[str, Any], asyncio.Future]
+
+
+@dataclass
+class BatchInsertWriter:
+    """Groups concurrent single-row inserts into multi-row ``INSERT`` statements.
+
+    Rows written while a batch is being flushed are queued and flushed together
+    in the next batch, so a lone write is inserted immediately while bursts of
+    writes share one round-trip and one commit.
+    """
+
+    model: type[DeclarativeBase]
+    session_maker: Callable[[], AsyncSession]
+    max_batch_size: int = 256
+    max_queue_size: int = 4096
+
+    _queue: asyncio.Queue[_Item | None] | None = field(default=None, init=False)
+    _task: asyncio.Task[None] | None = field(default=None, init=False)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._task = asyncio.create_task(self._consume())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        task, self._task = self._task, None
+        await self._queue.put(None)
+        await task
+
+    async def write(self, values: dict[str, Any]) -> None:
+        item: _Item = (values, asyncio.get_running_loop().create_future())
+
+        if self._task is None or self._queue.full():
+            await self._flush([item])
+        else:
+            self._queue.put_nowait(item)
+
+        await item[1]
+
+    async def _consume(self) -> None:
+        while item := await self._queue.get():
+            batch = [item]
+
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                if not (item := self._queue.get_nowait()):
+                    await self._flush(batch)
+                    return
+                batch.append(item)
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[_Item]) -> None:
+        try:
+            await self._insert([values for values, _ in batch])
+        except IntegrityError as ex:
+            if len(batch) > 1:
+                # isolate the offending rows so they don't fail the whole batch
+                for item in batch:
+                    await self._flush([item])
+                return
+
+            self._fail(batch, ex)
+        except Exception as ex:
+            # not caused by the rows themselves (e.g. the database is down)
+            self._fail(batch, ex)
+        else:
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+
+    @staticmethod
+    def _fail(batch: list[_Item], ex: Exception) -> None:
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(ex)
+
+    async def _insert(self, rows: list[dict[str, Any]]) -> None:
+        async with self.session_maker() as session:
+            await session.execute(insert(self.model), rows)
+            await session.commit()
@@ -1,6 +1,6 @@
-from passlib.context import CryptContext
+import bcrypt
 
-hash_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+BCRYPT_ROUNDS = 12
 
 
 def verify_password(user_password: str, hashed_password: str) -> bool:
@@ -10,7 +10,7 @@ def verify_password(user_password: str, hashed_password: str) -> bool:
     :param hashed_password: hashed password
     :return: ``True`` if the hashed term is the specified user term, else ``None``
     """
-    return hash_context.verify(user_password, hashed_password)
+    return bcrypt.checkpw(user_password.encode(), hashed_password.encode())
 
 
 def generate_hashed_password(*, password: str) -> str:
@@ -19,4 +19,4 @@ def generate_hashed_password(*, password: str) -> str:
     :param password: Password string which must be hashed
     :return: A hashed string
     """
-    return hash_context.hash(password)
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(BCRYPT_ROUNDS)).decode()
@@ -1,55 +1,62 @@
-import secrets
+from secrets import token_urlsafe
+from hashlib import sha256
+from time import time
 from typing import Any, Union
 import jwt
+import msgspec
 
-from datetime import datetime, timedelta
+from datetime import timedelta
 from app.core import settings
 
-from litestar.exceptions import NotAuthorizedException
+from cryptography.hazmat.primitives.asymmetric.types import PrivateKeyTypes
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
 
-from app.domain.schemas import AccessTokenPayload
+_auth_settings = settings.auth
 
-from .utils import get_authorization_scheme_param
+API_KEY_HEADER = _auth_settings.KEY_HEADER
+TOKEN_TYPE = _auth_settings.TOKEN_TYPE
+ALGORITHM = _auth_settings.ALGORITHM
 
-API_KEY_HEADER = settings.auth.KEY_HEADER
+PRIVATE_KEY = load_pem_private_key(
+    _auth_settings.JWT_PRIVATE_KEY_PATH.read_bytes(), password=None
+)
+
+ACCESS_TOKEN_EXPIRES = timedelta(minutes=_auth_settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+ACCESS_TOKEN_EXPIRES_SECONDS = int(ACCESS_TOKEN_EXPIRES.total_seconds())
+REFRESH_TOKEN_EXPIRES_SECONDS = int(
+    timedelta(days=_auth_settings.REFRESH_TOKEN_EXPIRE_DAYS).total_seconds()
+)
+
+_jws_encode = jwt.PyJWS().encode
+_json_encode = msgspec.json.Encoder().encode
 
 
 def encode_jwt_token(
     subject: Union[str, Any],
-    private_key: str = settings.auth.JWT_PRIVATE_KEY_PATH.read_text(),
-    algorithm: str = settings.auth.ALGORITHM,
+    private_key: PrivateKeyTypes = PRIVATE_KEY,
+    algorithm: str = ALGORITHM,
     *,
     expires: timedelta | None = None,
 ) -> str:
+    now = int(time())
+
     if expires:
-        expire = datetime.utcnow() + expires  # noqa: DTZ003
+        expire = now + int(expires.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(  # noqa: DTZ003
-            minutes=float(settings.auth.ACCESS_TOKEN_EXPIRE_MINUTES)
-        )
+        expire = now + ACCESS_TOKEN_EXPIRES_SECONDS
 
     payload = {
         "sub": subject,
-        "iat": datetime.utcnow(),  # noqa: DTZ003
+        "iat": now,
         "exp": expire,
     }
 
-    return jwt.encode(payload, private_key, algorithm)
-
-
-def decode_jwt_token(
-    token_header_value: str,
-    public_key: str = settings.auth.JWT_PUBLIC_KEY_PATH.read_text(),
-    algorithm: str = settings.auth.ALGORITHM,
-) -> Any:
-    token_type, token_value = get_authorization_scheme_param(token_header_value)
-    if token_type.lower() != "bearer":
-        raise NotAuthorizedException()
+    return _jws_encode(_json_encode(payload), private_key, algorithm)
 
-    payload = jwt.decode(token_value, public_key, algorithms=[algorithm])
 
-    return AccessTokenPayload(**payload)
+def generate_refresh_token(length: int = 32) -> str:
+    return token_urlsafe(length)
 
 
-def generate_refresh_token(lenght: int = 64) -> str:
-    return secrets.token_urlsafe(lenght)
+def hash_refresh_token(refresh_token: str) -> bytes:
+    return sha256(refresh_token.encode()).digest()
@@ -33,7 +33,7 @@ def configure_app() -> Litestar:
         on_app_init=[o2auth.on_app_init],
         middleware=[o2auth.middleware],
         listeners=[listeners.user_created],
-        lifespan=[events.lifespan],
+        lifespan=[events.lifespan, events.refresh_token_writer_lifespan],
     )
 
 
@@ -4,6 +4,8 @@ from contextlib import asynccontextmanager
 
 from aio_pika import Connection
 
+from app.core.config import refresh_token_writer
+
 
 @asynccontextmanager
 async def lifespan(app: Litestar) -> AsyncGenerator[None, None]:
@@ -22,3 +24,13 @@ async def lifespan(app: Litestar) -> AsyncGenerator[None, None]:
         await connection.close()
     except Exception as e:
         raise e
+
+
+@asynccontextmanager
+async def refresh_token_writer_lifespan(app: Litestar) -> AsyncGenerator[None, None]:
+    await refresh_token_writer.start()
+
+    try:
+        yield
+    finally:
+        await refresh_token_writer.stop()
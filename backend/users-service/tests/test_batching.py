@@ -0,0 +1,143 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any
+
+import pytest
+from sqlalchemy import ForeignKey, event, func, select
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from app.lib.batching import BatchInsertWriter
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Parent(Base):
+    __tablename__ = "parents"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+
+class Child(Base):
+    __tablename__ = "children"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    parent_id: Mapped[int] = mapped_column(ForeignKey("parents.id"))
+
+
+@dataclass
+class RecordingWriter(BatchInsertWriter):
+    """Records the size of every ``INSERT`` the writer issues."""
+
+    inserts: list[int] = field(default_factory=list, init=False)
+
+    async def _insert(self, rows: list[dict[str, Any]]) -> None:
+        self.inserts.append(len(rows))
+        await super()._insert(rows)
+
+
+class BrokenWriter(RecordingWriter):
+    """Fails every ``INSERT`` as if the database were unreachable."""
+
+    async def _insert(self, rows: list[dict[str, Any]]) -> None:
+        self.inserts.append(len(rows))
+        raise OperationalError("INSERT", {}, ConnectionRefusedError())
+
+
+@pytest.fixture
+async def session_maker(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def enable_foreign_keys(dbapi_connection, _) -> None:
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(Parent.__table__.insert(), [{"id": 1}])
+
+    yield async_sessionmaker(engine, expire_on_commit=False)
+
+    await engine.dispose()
+
+
+async def count_children(session_maker) -> int:
+    async with session_maker() as session:
+        return await session.scalar(select(func.count()).select_from(Child))
+
+
+async def test_write_without_start_inserts_directly(session_maker) -> None:
+    writer = RecordingWriter(model=Child, session_maker=session_maker)
+
+    await writer.write({"parent_id": 1})
+
+    assert writer.inserts == [1]
+    assert await count_children(session_maker) == 1
+
+
+async def test_concurrent_writes_are_coalesced(session_maker) -> None:
+    writer = RecordingWriter(model=Child, session_maker=session_maker)
+    await writer.start()
+
+    await asyncio.gather(*(writer.write({"parent_id": 1}) for _ in range(100)))
+    await writer.stop()
+
+    assert sum(writer.inserts) == 100
+    assert len(writer.inserts) < 100
+    assert await count_children(session_maker) == 100
+
+
+async def test_batches_are_bounded_by_max_batch_size(session_maker) -> None:
+    writer = RecordingWriter(model=Child, session_maker=session_maker, max_batch_size=8)
+    await writer.start()
+
+    await asyncio.gather(*(writer.write({"parent_id": 1}) for _ in range(50)))
+    await writer.stop()
+
+    assert sum(writer.inserts) == 50
+    assert max(writer.inserts) <= 8
+
+
+async def test_failing_row_does_not_fail_its_batch(session_maker) -> None:
+    writer = RecordingWriter(model=Child, session_maker=session_maker)
+    await writer.start()
+
+    rows = [{"parent_id": 1}] * 10 + [{"parent_id": 404}] + [{"parent_id": 1}] * 10
+    results = await asyncio.gather(
+        *(writer.write(row) for row in rows), return_exceptions=True
+    )
+    await writer.stop()
+
+    assert isinstance(results[10], IntegrityError)
+    assert results[:10] + results[11:] == [None] * 20
+    assert await count_children(session_maker) == 20
+
+
+async def test_database_outage_fails_the_whole_batch_once(session_maker) -> None:
+    writer = BrokenWriter(model=Child, session_maker=session_maker)
+    await writer.start()
+
+    results = await asyncio.gather(
+        *(writer.write({"parent_id": 1}) for _ in range(20)), return_exceptions=True
+    )
+    await writer.stop()
+
+    assert all(isinstance(result, OperationalError) for result in results)
+    # rows are not retried one by one when the rows aren't at fault
+    assert sum(writer.inserts) == 20
+    assert len(writer.inserts) < 20
+
+
+async def test_stop_drains_queued_rows(session_maker) -> None:
+    writer = RecordingWriter(model=Child, session_maker=session_maker)
+    await writer.start()
+
+    writes = [asyncio.create_task(writer.write({"parent_id": 1})) for _ in range(30)]
+    await asyncio.sleep(0)  # let the writes reach the queue
+    await writer.stop()
+
+    assert all(write.done() and write.exception() is None for write in writes)
+    assert await count_children(session_maker) == 30